@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Bulk Password Tool for Digital Agency Platform
+Hashes or verifies many passwords in parallel, one worker per CPU core
+"""
+
+import os
+import sys
+import concurrent.futures
+
+import bcrypt
+from argon2 import PasswordHasher
+from argon2.exceptions import VerifyMismatchError, VerificationError
+
+password_hasher = PasswordHasher()
+
+def hash_one(password):
+    return password_hasher.hash(password)
+
+def verify_one(pair):
+    password, hashed = pair
+    # Legacy bcrypt hashes from before the Argon2 migration
+    if hashed.startswith("$2"):
+        return bcrypt.checkpw(password.encode('utf-8')[:72], hashed.encode('utf-8'))
+    try:
+        return password_hasher.verify(hashed, password)
+    except (VerifyMismatchError, VerificationError):
+        return False
+
+def hash_passwords(passwords, max_workers=None):
+    """Hash many passwords in parallel across processes.
+
+    Password hashing releases no meaningful time to threads because each
+    hash is one long native call, so processes are used to spread the
+    work over physical cores.
+    """
+    workers = max_workers or os.cpu_count()
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(hash_one, passwords, chunksize=8))
+
+def verify_passwords(pairs, max_workers=None):
+    """Verify (password, stored_hash) pairs in parallel across processes"""
+    workers = max_workers or os.cpu_count()
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(verify_one, pairs, chunksize=8))
+
+def main():
+    print("🔐 Bulk Password Tool for Digital Agency Platform", file=sys.stderr)
+    print(f"⚙️  Using {os.cpu_count()} worker processes", file=sys.stderr)
+
+    passwords = [line.rstrip("\n") for line in sys.stdin if line.strip()]
+    if not passwords:
+        print("⚠️  No passwords on stdin (one per line)", file=sys.stderr)
+        sys.exit(1)
+
+    for hashed in hash_passwords(passwords):
+        print(hashed)
+
+    print(f"✅ Hashed {len(passwords)} passwords", file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
@@ -4,6 +4,7 @@ JWT Secret Generator for Digital Agency Platform
 Generates cryptographically secure JWT secrets for production use
 """
 
+import os
 import secrets
 import hashlib
 import base64
@@ -13,13 +14,13 @@ def generate_jwt_secret(length=64):
     """Generate a cryptographically secure JWT secret"""
     return secrets.token_urlsafe(length)
 
-def generate_multiple_secrets(count=3):
-    """Generate multiple JWT secrets to choose from"""
-    secrets_list = []
-    for i in range(count):
-        secret = generate_jwt_secret()
-        secrets_list.append(secret)
-    return secrets_list
+def generate_multiple_secrets(count=3, length=64):
+    """Generate multiple JWT secrets from a single urandom draw"""
+    raw = os.urandom(count * length)
+    return [
+        base64.urlsafe_b64encode(raw[i * length:(i + 1) * length]).rstrip(b'=').decode()
+        for i in range(count)
+    ]
 
 def main():
     print("🔐 JWT Secret Generator for Digital Agency Platform")
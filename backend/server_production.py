@@ -1,13 +1,23 @@
 import os
-import jwt
+from jose import jwt, JWTError
 import bcrypt
+from argon2 import PasswordHasher
+from argon2.exceptions import VerifyMismatchError, VerificationError
+import hashlib
+import threading
+import time
+import asyncio
+import concurrent.futures
 from datetime import datetime, timedelta
 from typing import Optional, List
-from fastapi import FastAPI, HTTPException, Depends, status
+from fastapi import FastAPI, HTTPException, Depends, Query, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel, EmailStr
-from pymongo import MongoClient
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel, EmailStr, TypeAdapter
+from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo.errors import DuplicateKeyError
+from cachetools import TTLCache
 from contextlib import asynccontextmanager
 import uuid
 import socketio
@@ -21,6 +31,22 @@ JWT_SECRET = os.environ.get("JWT_SECRET")
 JWT_ALGORITHM = "HS256"
 ENVIRONMENT = os.environ.get("ENVIRONMENT", "development")
 CORS_ORIGINS = os.environ.get("CORS_ORIGINS", "*").split(",")
+# Password hashing blocks for ~100ms per call, so it runs on worker
+# threads instead of the event loop
+PASSWORD_POOL = concurrent.futures.ThreadPoolExecutor(max_workers=os.cpu_count())
+
+# Argon2 for new hashes; bcrypt is kept only to verify pre-migration hashes
+password_hasher = PasswordHasher()
+
+# Second-granularity clock refreshed by a background task; token expiry
+# doesn't need a fresh clock read per call
+CACHED_NOW = int(time.time())
+
+async def refresh_cached_now():
+    global CACHED_NOW
+    while True:
+        CACHED_NOW = int(time.time())
+        await asyncio.sleep(0.5)
 
 # Validate required environment variables
 if not MONGO_URL:
@@ -32,55 +58,116 @@ if not JWT_SECRET:
         JWT_SECRET = "development-key-not-secure"
         print("⚠️  Using default JWT secret for development")
 
-# MongoDB connection with error handling
-try:
-    client = MongoClient(MONGO_URL)
-    # Test the connection
-    client.admin.command('ping')
-    db = client[DB_NAME]
-    print(f"✅ Connected to MongoDB: {MONGO_URL}")
-except Exception as e:
-    print(f"❌ Failed to connect to MongoDB: {e}")
-    raise
-
-# Collections
-users_collection = db.users
-projects_collection = db.projects
-tasks_collection = db.tasks
+# Encoded once at import; jose accepts bytes keys, so the per-request
+# token paths skip re-encoding the secret
+JWT_SECRET_BYTES = JWT_SECRET.encode('utf-8')
+
+# MongoDB connection and collections, created in lifespan so the async
+# client binds to the running event loop
+client = None
+db = None
+users_collection = None
+projects_collection = None
+tasks_collection = None
 
 # Socket.io setup
+# Packet-level logging burns CPU on every heartbeat, so it stays off
+# outside development
 sio = socketio.AsyncServer(
     cors_allowed_origins="*" if ENVIRONMENT == "development" else CORS_ORIGINS,
-    logger=True,
-    engineio_logger=True
+    logger=ENVIRONMENT != "production",
+    engineio_logger=False
 )
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
+    global client, db, users_collection, projects_collection, tasks_collection
+
     print("🚀 Digital Agency Platform Starting...")
     print(f"📊 Environment: {ENVIRONMENT}")
     print(f"🗃️  Database: {DB_NAME}")
     print(f"🌐 CORS Origins: {CORS_ORIGINS}")
-    
+
+    # MongoDB connection with error handling. Compression is negotiated
+    # with the server, so it degrades gracefully if unsupported.
+    try:
+        client = AsyncIOMotorClient(
+            MONGO_URL,
+            maxPoolSize=200,
+            minPoolSize=20,
+            compressors="zstd",
+            retryReads=True
+        )
+        # Test the connection
+        await client.admin.command('ping')
+        db = client[DB_NAME]
+        print(f"✅ Connected to MongoDB: {MONGO_URL}")
+    except Exception as e:
+        print(f"❌ Failed to connect to MongoDB: {e}")
+        raise
+
+    # Collections
+    users_collection = db.users
+    projects_collection = db.projects
+    tasks_collection = db.tasks
+
+    # One-off migration for documents written before the $lookup schema,
+    # which embedded user dicts instead of storing ids
+    try:
+        await projects_collection.update_many(
+            {"team_member_ids": {"$exists": False}},
+            [{"$set": {"team_member_ids": {"$map": {
+                "input": {"$ifNull": ["$team_members", []]},
+                "as": "member",
+                "in": "$$member.user_id"
+            }}}}]
+        )
+        await tasks_collection.update_many(
+            {"assigned_to": {"$type": "object"}},
+            [{"$set": {"assigned_to": "$assigned_to.user_id"}}]
+        )
+        print("✅ Legacy embedded-user documents migrated")
+    except Exception as e:
+        print(f"⚠️  Migration warning: {e}")
+
     # Create indexes for better performance
     try:
-        users_collection.create_index("email", unique=True)
-        projects_collection.create_index("project_id", unique=True)
-        tasks_collection.create_index("task_id", unique=True)
-        tasks_collection.create_index("project_id")
+        await users_collection.create_index("email", unique=True)
+        await users_collection.create_index([("created_at", -1)])
+        await projects_collection.create_index("project_id", unique=True)
+        await projects_collection.create_index([("created_at", -1)])
+        await tasks_collection.create_index("task_id", unique=True)
+        # Compound indexes so the {project_id, task_id} lookups and the
+        # created_at-sorted Kanban-board listing avoid in-memory work
+        await tasks_collection.create_index([("project_id", 1), ("task_id", 1)], unique=True)
+        await tasks_collection.create_index([("project_id", 1), ("created_at", -1)])
         print("✅ Database indexes created")
     except Exception as e:
         print(f"⚠️  Index creation warning: {e}")
-    
+
+    # Existing deployments still carry the single-field project_id index
+    # on tasks; the (project_id, task_id) compound prefix covers it. The
+    # drop fails harmlessly where the index never existed.
+    try:
+        await tasks_collection.drop_index("project_id_1")
+        print("✅ Dropped redundant tasks.project_id index")
+    except Exception:
+        pass
+
+    clock_task = asyncio.create_task(refresh_cached_now())
+
     yield
     print("🔄 Shutting down...")
+    clock_task.cancel()
+    client.close()
 
 # FastAPI app
 app = FastAPI(
     title="Digital Agency Management Platform",
     description="A comprehensive platform for managing digital agency operations",
     version="1.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
 
 # CORS middleware with production settings
@@ -98,6 +185,12 @@ socket_manager = SocketManager(app=app, socketio_path="/ws")
 # Security
 security = HTTPBearer()
 
+# Cache of validated tokens so repeated requests skip the signature verify
+# and user lookup. Keyed by a token digest so raw tokens never sit in memory.
+TOKEN_CACHE_TTL = 300
+token_cache = TTLCache(maxsize=10000, ttl=TOKEN_CACHE_TTL)
+token_cache_lock = threading.Lock()
+
 # Pydantic models
 class UserCreate(BaseModel):
     name: str
@@ -158,39 +251,156 @@ class TaskUpdate(BaseModel):
     assigned_to: Optional[str] = None
     priority: Optional[str] = None
 
+# Adapters built once at import so dumping response payloads doesn't
+# rebuild Pydantic's field walkers on every call
+PROJECT_ADAPTER = TypeAdapter(ProjectResponse)
+TASK_ADAPTER = TypeAdapter(TaskResponse)
+
+def project_payload(project: dict) -> dict:
+    return PROJECT_ADAPTER.dump_python(ProjectResponse.model_construct(**project))
+
+def task_payload(task: dict) -> dict:
+    return TASK_ADAPTER.dump_python(TaskResponse.model_construct(**task))
+
 # Utility functions
 def hash_password(password: str) -> str:
-    return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
+    return password_hasher.hash(password)
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return bcrypt.checkpw(plain_password.encode('utf-8'), hashed_password.encode('utf-8'))
+    # Legacy bcrypt hashes from before the Argon2 migration; bcrypt only
+    # reads the first 72 bytes, so truncate explicitly up front
+    if hashed_password.startswith("$2"):
+        return bcrypt.checkpw(plain_password.encode('utf-8')[:72], hashed_password.encode('utf-8'))
+    try:
+        return password_hasher.verify(hashed_password, plain_password)
+    except (VerifyMismatchError, VerificationError):
+        return False
+
+async def hash_password_async(password: str) -> str:
+    return await asyncio.get_running_loop().run_in_executor(PASSWORD_POOL, hash_password, password)
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    return await asyncio.get_running_loop().run_in_executor(PASSWORD_POOL, verify_password, plain_password, hashed_password)
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     to_encode = data.copy()
     if expires_delta:
-        expire = datetime.utcnow() + expires_delta
+        expire = CACHED_NOW + int(expires_delta.total_seconds())
     else:
-        expire = datetime.utcnow() + timedelta(days=7)
+        expire = CACHED_NOW + 7 * 86400
     to_encode.update({"exp": expire})
-    encoded_jwt = jwt.encode(to_encode, JWT_SECRET, algorithm=JWT_ALGORITHM)
+    encoded_jwt = jwt.encode(to_encode, JWT_SECRET_BYTES, algorithm=JWT_ALGORITHM)
     return encoded_jwt
 
-def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)):
+def get_token_payload(credentials: HTTPAuthorizationCredentials = Depends(security)):
+    token = credentials.credentials
+    cache_key = hashlib.blake2b(token.encode('utf-8'), digest_size=16).digest()
+
+    # Fast path: token was validated recently
+    with token_cache_lock:
+        cached = token_cache.get(cache_key)
+    if cached is not None:
+        expires_at, payload = cached
+        if time.time() < expires_at:
+            return payload
+        with token_cache_lock:
+            token_cache.pop(cache_key, None)
+
     try:
-        token = credentials.credentials
-        payload = jwt.decode(token, JWT_SECRET, algorithms=[JWT_ALGORITHM])
-        user_id: str = payload.get("sub")
-        if user_id is None:
+        # require_exp: every token we issue carries exp, and the cache
+        # expiry math below depends on it
+        payload = jwt.decode(token, JWT_SECRET_BYTES, algorithms=[JWT_ALGORITHM], options={"require_exp": True})
+        if payload.get("sub") is None:
             raise HTTPException(status_code=401, detail="Invalid token")
-        
-        user = users_collection.find_one({"user_id": user_id})
-        if user is None:
-            raise HTTPException(status_code=401, detail="User not found")
-        
-        return user
-    except jwt.PyJWTError:
+
+        # Cache successful validations only, never past the token's own expiry
+        expires_at = min(payload["exp"], time.time() + TOKEN_CACHE_TTL)
+        with token_cache_lock:
+            token_cache[cache_key] = (expires_at, payload)
+
+        return payload
+    except JWTError:
         raise HTTPException(status_code=401, detail="Invalid token")
 
+def get_current_user_id(payload: dict = Depends(get_token_payload)) -> str:
+    """Authenticated user's id straight from the token, no DB round trip."""
+    return payload["sub"]
+
+async def get_current_user(payload: dict = Depends(get_token_payload)):
+    user = (await hydrate_users([payload["sub"]])).get(payload["sub"])
+    if user is None:
+        raise HTTPException(status_code=401, detail="User not found")
+    return user
+
+# Aggregation stages that hydrate user references in a single round trip
+# instead of issuing one extra query per referenced user
+TEAM_MEMBERS_LOOKUP = {
+    "$lookup": {
+        "from": "users",
+        "localField": "team_member_ids",
+        "foreignField": "user_id",
+        "as": "team_members",
+        "pipeline": [{"$project": {"_id": 0, "password": 0}}]
+    }
+}
+
+ASSIGNEE_LOOKUP = [
+    {
+        "$lookup": {
+            "from": "users",
+            "localField": "assigned_to",
+            "foreignField": "user_id",
+            "as": "assigned_to",
+            "pipeline": [{"$project": {"_id": 0, "password": 0}}]
+        }
+    },
+    {"$addFields": {"assigned_to": {"$arrayElemAt": ["$assigned_to", 0]}}}
+]
+
+async def get_project_with_team(project_id: str):
+    projects = await projects_collection.aggregate([
+        {"$match": {"project_id": project_id}},
+        TEAM_MEMBERS_LOOKUP
+    ]).to_list(length=1)
+    return projects[0] if projects else None
+
+# Short-lived cache of user docs so busy projects don't re-fetch the
+# same members on every write
+USER_CACHE_TTL = 60
+user_cache = TTLCache(maxsize=10000, ttl=USER_CACHE_TTL)
+user_cache_lock = threading.Lock()
+
+async def hydrate_users(user_ids):
+    """Map user ids to their docs, fetching cache misses in one query."""
+    users = {}
+    missing = []
+    with user_cache_lock:
+        for user_id in user_ids:
+            cached = user_cache.get(user_id)
+            if cached is not None:
+                users[user_id] = cached
+            else:
+                missing.append(user_id)
+
+    if missing:
+        fetched = await users_collection.find({"user_id": {"$in": missing}}, {"_id": 0, "password": 0}).to_list(length=len(missing))
+        with user_cache_lock:
+            for user in fetched:
+                user_cache[user["user_id"]] = user
+                users[user["user_id"]] = user
+
+    return users
+
+# Room broadcasts fan out to every subscriber; run them as background
+# tasks so HTTP responses don't wait on the emit loop. The set keeps a
+# strong reference until each emit finishes.
+background_emits = set()
+
+def emit_in_background(event, data, room):
+    emit_task = asyncio.create_task(sio.emit(event, data, room=room))
+    background_emits.add(emit_task)
+    emit_task.add_done_callback(background_emits.discard)
+
 # Socket.io events
 @sio.event
 async def connect(sid, environ):
@@ -228,7 +438,7 @@ async def root():
 async def health_check():
     try:
         # Test database connection
-        client.admin.command('ping')
+        await client.admin.command('ping')
         db_status = "connected"
     except Exception:
         db_status = "disconnected"
@@ -244,14 +454,9 @@ async def health_check():
 # Auth routes
 @app.post("/api/auth/register")
 async def register_user(user: UserCreate):
-    # Check if user exists
-    existing_user = users_collection.find_one({"email": user.email})
-    if existing_user:
-        raise HTTPException(status_code=400, detail="Email already registered")
-    
     # Create user
-    user_id = str(uuid.uuid4())
-    hashed_password = hash_password(user.password)
+    user_id = uuid.uuid4().hex
+    hashed_password = await hash_password_async(user.password)
     
     new_user = {
         "user_id": user_id,
@@ -262,11 +467,16 @@ async def register_user(user: UserCreate):
         "created_at": datetime.utcnow()
     }
     
-    users_collection.insert_one(new_user)
-    
+    # The unique index on email makes the duplicate check atomic; no
+    # separate existence query needed
+    try:
+        await users_collection.insert_one(new_user)
+    except DuplicateKeyError:
+        raise HTTPException(status_code=400, detail="Email already registered")
+
     # Create token
     access_token = create_access_token(data={"sub": user_id})
-    
+
     return {
         "message": "User created successfully",
         "access_token": access_token,
@@ -277,10 +487,15 @@ async def register_user(user: UserCreate):
 @app.post("/api/auth/login")
 async def login_user(user_login: UserLogin):
     # Find user
-    user = users_collection.find_one({"email": user_login.email})
-    if not user or not verify_password(user_login.password, user["password"]):
+    user = await users_collection.find_one({"email": user_login.email})
+    if not user or not await verify_password_async(user_login.password, user["password"]):
         raise HTTPException(status_code=401, detail="Invalid credentials")
-    
+
+    # Opportunistically upgrade legacy bcrypt hashes to Argon2
+    if user["password"].startswith("$2"):
+        new_hash = await hash_password_async(user_login.password)
+        await users_collection.update_one({"user_id": user["user_id"]}, {"$set": {"password": new_hash}})
+
     # Create token
     access_token = create_access_token(data={"sub": user["user_id"]})
     
@@ -297,179 +512,178 @@ async def get_current_user_profile(current_user: dict = Depends(get_current_user
 
 # User routes
 @app.get("/api/users")
-async def get_users(current_user: dict = Depends(get_current_user)):
-    users = list(users_collection.find({}, {"password": 0}))
-    return [UserResponse(**user) for user in users]
+async def get_users(skip: int = Query(0, ge=0), limit: int = Query(50, ge=1, le=200), current_user_id: str = Depends(get_current_user_id)):
+    # Documents come from our own store with the shape we wrote; skip
+    # re-validating every field through Pydantic on the read path
+    return await users_collection.find({}, {"_id": 0, "password": 0}).sort("created_at", -1).skip(skip).limit(limit).to_list(length=limit)
 
 # Project routes
 @app.post("/api/projects")
-async def create_project(project: ProjectCreate, current_user: dict = Depends(get_current_user)):
-    project_id = str(uuid.uuid4())
-    
-    # Get team member details
-    team_member_details = []
-    if project.team_members:
-        team_members = list(users_collection.find({"user_id": {"$in": project.team_members}}, {"password": 0}))
-        team_member_details = [UserResponse(**member).model_dump() for member in team_members]
-    
+async def create_project(project: ProjectCreate, current_user_id: str = Depends(get_current_user_id)):
+    project_id = uuid.uuid4().hex
+
     new_project = {
         "project_id": project_id,
         "name": project.name,
         "description": project.description,
         "client_name": project.client_name,
         "status": project.status,
-        "team_members": team_member_details,
+        "team_member_ids": project.team_members,
         "created_at": datetime.utcnow(),
-        "created_by": current_user["user_id"]
+        "created_by": current_user_id
     }
-    
-    projects_collection.insert_one(new_project)
-    
+
+    await projects_collection.insert_one(new_project)
+
+    team_members = await hydrate_users(project.team_members)
+    created_project = {**new_project, "team_members": [team_members[m] for m in project.team_members if m in team_members]}
+
     return {
         "message": "Project created successfully",
-        "project": ProjectResponse(**new_project)
+        "project": project_payload(created_project)
     }
 
 @app.get("/api/projects")
-async def get_projects(current_user: dict = Depends(get_current_user)):
-    projects = list(projects_collection.find())
-    return [ProjectResponse(**project) for project in projects]
+async def get_projects(skip: int = Query(0, ge=0), limit: int = Query(50, ge=1, le=200), current_user_id: str = Depends(get_current_user_id)):
+    projects = await projects_collection.aggregate([
+        {"$sort": {"created_at": -1}},
+        {"$skip": skip},
+        {"$limit": limit},
+        TEAM_MEMBERS_LOOKUP,
+        {"$project": {"_id": 0}}
+    ]).to_list(length=limit)
+    return projects
 
 @app.get("/api/projects/{project_id}")
-async def get_project(project_id: str, current_user: dict = Depends(get_current_user)):
-    project = projects_collection.find_one({"project_id": project_id})
+async def get_project(project_id: str, current_user_id: str = Depends(get_current_user_id)):
+    project = await get_project_with_team(project_id)
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
-    
+
     return ProjectResponse(**project)
 
 @app.put("/api/projects/{project_id}")
-async def update_project(project_id: str, project_update: ProjectCreate, current_user: dict = Depends(get_current_user)):
-    project = projects_collection.find_one({"project_id": project_id})
+async def update_project(project_id: str, project_update: ProjectCreate, current_user_id: str = Depends(get_current_user_id)):
+    project = await projects_collection.find_one({"project_id": project_id})
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
     
-    # Get team member details
-    team_member_details = []
-    if project_update.team_members:
-        team_members = list(users_collection.find({"user_id": {"$in": project_update.team_members}}, {"password": 0}))
-        team_member_details = [UserResponse(**member).model_dump() for member in team_members]
-    
     update_data = {
         "name": project_update.name,
         "description": project_update.description,
         "client_name": project_update.client_name,
         "status": project_update.status,
-        "team_members": team_member_details,
+        "team_member_ids": project_update.team_members,
         "updated_at": datetime.utcnow()
     }
-    
-    projects_collection.update_one({"project_id": project_id}, {"$set": update_data})
-    
-    updated_project = projects_collection.find_one({"project_id": project_id})
-    return ProjectResponse(**updated_project)
+
+    await projects_collection.update_one({"project_id": project_id}, {"$set": update_data})
+
+    team_members = await hydrate_users(project_update.team_members)
+    updated_project = {**project, **update_data, "team_members": [team_members[m] for m in project_update.team_members if m in team_members]}
+    return project_payload(updated_project)
 
 @app.delete("/api/projects/{project_id}")
-async def delete_project(project_id: str, current_user: dict = Depends(get_current_user)):
-    project = projects_collection.find_one({"project_id": project_id})
+async def delete_project(project_id: str, current_user_id: str = Depends(get_current_user_id)):
+    project = await projects_collection.find_one({"project_id": project_id})
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
     
     # Delete project and all its tasks
-    projects_collection.delete_one({"project_id": project_id})
-    tasks_collection.delete_many({"project_id": project_id})
+    await projects_collection.delete_one({"project_id": project_id})
+    await tasks_collection.delete_many({"project_id": project_id})
     
     return {"message": "Project deleted successfully"}
 
 # Task routes (Kanban Board)
 @app.post("/api/projects/{project_id}/tasks")
-async def create_task(project_id: str, task: TaskCreate, current_user: dict = Depends(get_current_user)):
+async def create_task(project_id: str, task: TaskCreate, current_user_id: str = Depends(get_current_user_id)):
     # Verify project exists
-    project = projects_collection.find_one({"project_id": project_id})
+    project = await projects_collection.find_one({"project_id": project_id})
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
     
-    task_id = str(uuid.uuid4())
-    
-    # Get assigned user details if provided
-    assigned_user = None
-    if task.assigned_to:
-        assigned_user_data = users_collection.find_one({"user_id": task.assigned_to}, {"password": 0})
-        if assigned_user_data:
-            assigned_user = UserResponse(**assigned_user_data).model_dump()
-    
+    task_id = uuid.uuid4().hex
+
     new_task = {
         "task_id": task_id,
         "title": task.title,
         "description": task.description,
         "status": task.status,
-        "assigned_to": assigned_user,
+        "assigned_to": task.assigned_to,
         "priority": task.priority,
         "project_id": project_id,
         "created_at": datetime.utcnow(),
-        "created_by": current_user["user_id"]
+        "created_by": current_user_id
     }
-    
-    tasks_collection.insert_one(new_task)
-    
+
+    await tasks_collection.insert_one(new_task)
+
+    assigned_user = None
+    if task.assigned_to:
+        assigned_user = (await hydrate_users([task.assigned_to])).get(task.assigned_to)
+    created_task = task_payload({**new_task, "assigned_to": assigned_user})
+
     # Emit real-time update
-    await sio.emit('task_created', {
-        "task": TaskResponse(**new_task).model_dump(),
+    emit_in_background('task_created', {
+        "task": created_task,
         "project_id": project_id
     }, room=f"project_{project_id}")
-    
+
     return {
         "message": "Task created successfully",
-        "task": TaskResponse(**new_task)
+        "task": created_task
     }
 
 @app.get("/api/projects/{project_id}/tasks")
-async def get_project_tasks(project_id: str, current_user: dict = Depends(get_current_user)):
-    tasks = list(tasks_collection.find({"project_id": project_id}))
-    return [TaskResponse(**task) for task in tasks]
+async def get_project_tasks(project_id: str, skip: int = Query(0, ge=0), limit: int = Query(50, ge=1, le=200), current_user_id: str = Depends(get_current_user_id)):
+    tasks = await tasks_collection.aggregate([
+        {"$match": {"project_id": project_id}},
+        {"$sort": {"created_at": -1}},
+        {"$skip": skip},
+        {"$limit": limit},
+        *ASSIGNEE_LOOKUP,
+        {"$project": {"_id": 0}}
+    ]).to_list(length=limit)
+    return tasks
 
 @app.put("/api/projects/{project_id}/tasks/{task_id}")
-async def update_task(project_id: str, task_id: str, task_update: TaskUpdate, current_user: dict = Depends(get_current_user)):
-    task = tasks_collection.find_one({"task_id": task_id, "project_id": project_id})
+async def update_task(project_id: str, task_id: str, task_update: TaskUpdate, current_user_id: str = Depends(get_current_user_id)):
+    task = await tasks_collection.find_one({"task_id": task_id, "project_id": project_id})
     if not task:
         raise HTTPException(status_code=404, detail="Task not found")
     
-    update_data = {}
-    for field, value in task_update.model_dump(exclude_unset=True).items():
-        if field == "assigned_to" and value:
-            # Get assigned user details
-            assigned_user_data = users_collection.find_one({"user_id": value}, {"password": 0})
-            if assigned_user_data:
-                update_data["assigned_to"] = UserResponse(**assigned_user_data).model_dump()
-            else:
-                update_data["assigned_to"] = None
-        else:
-            update_data[field] = value
-    
+    update_data = task_update.model_dump(exclude_unset=True)
     update_data["updated_at"] = datetime.utcnow()
-    
-    tasks_collection.update_one({"task_id": task_id}, {"$set": update_data})
-    
-    updated_task = tasks_collection.find_one({"task_id": task_id})
-    
+
+    await tasks_collection.update_one({"task_id": task_id}, {"$set": update_data})
+
+    updated_task = {**task, **update_data}
+    assigned_id = updated_task.get("assigned_to")
+    if isinstance(assigned_id, dict):
+        # Pre-migration tasks embedded the whole user doc
+        assigned_id = assigned_id.get("user_id")
+    updated_task["assigned_to"] = (await hydrate_users([assigned_id])).get(assigned_id) if assigned_id else None
+    updated_task = task_payload(updated_task)
+
     # Emit real-time update
-    await sio.emit('task_updated', {
-        "task": TaskResponse(**updated_task).model_dump(),
+    emit_in_background('task_updated', {
+        "task": updated_task,
         "project_id": project_id
     }, room=f"project_{project_id}")
-    
-    return TaskResponse(**updated_task)
+
+    return updated_task
 
 @app.delete("/api/projects/{project_id}/tasks/{task_id}")
-async def delete_task(project_id: str, task_id: str, current_user: dict = Depends(get_current_user)):
-    task = tasks_collection.find_one({"task_id": task_id, "project_id": project_id})
+async def delete_task(project_id: str, task_id: str, current_user_id: str = Depends(get_current_user_id)):
+    task = await tasks_collection.find_one({"task_id": task_id, "project_id": project_id})
     if not task:
         raise HTTPException(status_code=404, detail="Task not found")
     
-    tasks_collection.delete_one({"task_id": task_id})
+    await tasks_collection.delete_one({"task_id": task_id})
     
     # Emit real-time update
-    await sio.emit('task_deleted', {
+    emit_in_background('task_deleted', {
         "task_id": task_id,
         "project_id": project_id
     }, room=f"project_{project_id}")